@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Weather proxy backend for WeeWoo Map Friend.
+
+Serves the /api/weather endpoint described in project_docs/api/endpoints.md
+with support for multiple providers (mock, open-meteo, willyweather), plus a
+/health endpoint for monitoring. Responses are cached in-memory for
+CACHE_TTL_SECONDS to protect upstream quotas.
+
+Environment variables:
+  USE_MOCK             "1" to force the mock provider (default)
+  WILLYWEATHER_API_KEY API key for the WillyWeather provider
+  CACHE_TTL_SECONDS    Cache lifetime for forecast responses (default 300)
+  REQUEST_TIMEOUT      Upstream request timeout in seconds (default 5)
+"""
+
+import functools
+import os
+import threading
+import time
+from itertools import islice
+
+import requests
+from flask import Flask, jsonify, request
+
+# orjson is 2-10x faster than stdlib json on the small dicts this proxy
+# shuffles around; fall back to stdlib json when it isn't installed.
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+    _HAS_ORJSON = True
+except ImportError:
+    import json
+
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+    _HAS_ORJSON = False
+
+# One pooled session per process so upstream connections (Open-Meteo,
+# WillyWeather) are kept alive instead of paying TCP+TLS setup per request.
+SESSION = requests.Session()
+SESSION.mount('https://', requests.adapters.HTTPAdapter(
+    pool_connections=10, pool_maxsize=20))
+
+USE_MOCK = os.getenv('USE_MOCK', '1') == '1'
+WILLYWEATHER_API_KEY = os.getenv('WILLYWEATHER_API_KEY', '')
+CACHE_TTL_SECONDS = int(os.getenv('CACHE_TTL_SECONDS', '300'))
+REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '5'))
+
+if _HAS_ORJSON:
+    from flask.json.provider import DefaultJSONProvider
+
+    class ORJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson for faster (de)serialization."""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    class WeatherApp(Flask):
+        json_provider_class = ORJSONProvider
+
+    app = WeatherApp(__name__)
+else:
+    app = Flask(__name__)
+
+class TTLCache:
+    """Double-buffered expiring cache.
+
+    Writes go to the active buffer; once per TTL window the buffers swap
+    and the stale one is dropped in a single O(1) bulk operation. Entries
+    therefore live between TTL and 2*TTL, no per-entry timestamps are
+    stored, and memory is capped at two windows of traffic. Uses
+    time.monotonic() which is immune to wall-clock jumps.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.a = {}
+        self.b = {}
+        self.deadline = time.monotonic() + ttl
+
+    def _maybe_swap(self):
+        now = time.monotonic()
+        if now > self.deadline:
+            if now > self.deadline + self.ttl:
+                # More than one whole window has passed since the swap
+                # was due (idle gap): everything in both buffers is older
+                # than 2*TTL, so drop it all rather than rotating ancient
+                # entries back into service.
+                self.a = {}
+                self.b = {}
+            else:
+                self.b = self.a
+                self.a = {}
+            self.deadline = now + self.ttl
+
+    def get(self, key):
+        self._maybe_swap()
+        value = self.a.get(key)
+        if value is None:
+            value = self.b.get(key)
+        return value
+
+    def set(self, key, value):
+        self._maybe_swap()
+        self.a[key] = value
+
+
+cache = TTLCache(CACHE_TTL_SECONDS)
+
+
+def cache_get(key):
+    """Return a cached payload or None if missing/expired."""
+    return cache.get(key)
+
+
+def cache_set(key, payload):
+    """Store a payload for the current TTL window."""
+    cache.set(key, payload)
+
+
+# Open-Meteo WMO weather code groups, flattened once at import time into a
+# 100-slot list (codes are small non-negative ints) so each lookup is a
+# C-level list index rather than a hash probe.
+_OPEN_METEO_GROUPS = {
+    (0,): 'Clear sky',
+    (1,): 'Mainly clear',
+    (2,): 'Partly cloudy',
+    (3,): 'Overcast',
+    (45, 48): 'Fog',
+    (51, 53, 55): 'Drizzle',
+    (56, 57): 'Freezing drizzle',
+    (61, 63, 65): 'Rain',
+    (66, 67): 'Freezing rain',
+    (71, 73, 75): 'Snow',
+    (77,): 'Snow grains',
+    (80, 81, 82): 'Rain showers',
+    (85, 86): 'Snow showers',
+    (95,): 'Thunderstorm',
+    (96, 99): 'Thunderstorm with hail',
+}
+_CODE_TABLE = [None] * 100
+for _keys, _label in _OPEN_METEO_GROUPS.items():
+    for _code in _keys:
+        _CODE_TABLE[_code] = _label
+
+
+def map_open_meteo_code(code):
+    """Map an Open-Meteo WMO weather code to a human-readable summary."""
+    if 0 <= code < 100 and _CODE_TABLE[code]:
+        return _CODE_TABLE[code]
+    return f"Code {code}"
+
+
+def mock_forecast(lat, lon, days):
+    """Deterministic forecast used in development (USE_MOCK=1)."""
+    summaries = ['Sunny', 'Partly cloudy', 'Rain', 'Overcast', 'Clear sky',
+                 'Showers', 'Windy']
+    return {
+        'location': {'lat': lat, 'lon': lon},
+        'days': days,
+        'forecast': [
+            {
+                'day': i + 1,
+                'summary': summaries[i % len(summaries)],
+                'tempMin': 10 + (i % 5),
+                'tempMax': 18 + (i % 8),
+            }
+            for i in range(days)
+        ],
+    }
+
+
+def _get_json(url, *, params=None, headers=None, timeout=REQUEST_TIMEOUT):
+    """GET a URL and decode its JSON body via the pooled session.
+
+    Decodes from res.content with orjson, skipping requests' charset
+    sniffing in res.json(). Returns (data, response); a 304 yields
+    (None, response) so callers doing conditional GETs can fall back to
+    their cached copy.
+    """
+    res = SESSION.get(url, params=params, headers=headers, timeout=timeout)
+    if res.status_code == 304:
+        return None, res
+    res.raise_for_status()
+    return _json_loads(res.content), res
+
+
+# Upstream validators for conditional GET: key -> (etag, last_modified, payload).
+# Kept separately from the TTL cache so a stale-but-unchanged upstream response
+# can be revalidated with a ~zero-body 304 instead of a full re-download.
+# Bounded FIFO: entries hold whole payloads, so without a cap a client
+# sweeping coordinates could grow a long-lived worker without limit.
+_upstream_validators = {}
+_VALIDATORS_MAX = 1024
+
+
+def _validators_put(key, value):
+    if key not in _upstream_validators and \
+            len(_upstream_validators) >= _VALIDATORS_MAX:
+        # Evict the oldest insertion (dicts preserve insertion order)
+        del _upstream_validators[next(iter(_upstream_validators))]
+    _upstream_validators[key] = value
+
+
+def open_meteo_forecast(lat, lon, days):
+    """Fetch and normalize a forecast from the Open-Meteo API."""
+    url = 'https://api.open-meteo.com/v1/forecast'
+    params = {
+        'latitude': lat,
+        'longitude': lon,
+        'daily': 'temperature_2m_min,temperature_2m_max,weathercode',
+        'timezone': 'auto',
+        'forecast_days': days,
+    }
+
+    # Same 4-decimal canonical key as the TTL cache, so nearby requests
+    # share one validator entry instead of one per raw float
+    validator_key = f"open-meteo:{float(lat):.4f}:{float(lon):.4f}:{days}"
+    cached = _upstream_validators.get(validator_key)
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    j, res = _get_json(url, params=params, headers=headers)
+    if j is None and cached:
+        return cached[2]
+
+    daily = j.get('daily', {})
+
+    # Single C-level pass: zip truncates to the shortest series and islice
+    # caps at `days`, so no per-index len() guards are needed
+    forecast = [
+        {
+            'date': t,
+            'summary': map_open_meteo_code(c),
+            'tempMin': mn,
+            'tempMax': mx,
+        }
+        for t, c, mn, mx in islice(
+            zip(daily.get('time', []),
+                daily.get('weathercode', []),
+                daily.get('temperature_2m_min', []),
+                daily.get('temperature_2m_max', [])),
+            days)
+    ]
+
+    payload = {
+        'location': {'lat': lat, 'lon': lon},
+        'days': len(forecast),
+        'forecast': forecast,
+    }
+    if res.headers.get('ETag') or res.headers.get('Last-Modified'):
+        _validators_put(validator_key, (
+            res.headers.get('ETag'), res.headers.get('Last-Modified'), payload))
+    return payload
+
+
+# The x-payload headers are essentially static per (coords, days); cache the
+# encoded JSON so the hot path skips re-serializing it on every request.
+@functools.lru_cache(maxsize=1024)
+def _ww_search_payload(lat, lon):
+    return _json_dumps({'lat': lat, 'lng': lon, 'units': {'distance': 'km'}})
+
+
+@functools.lru_cache(maxsize=16)
+def _ww_forecast_payload(days):
+    return _json_dumps({'forecasts': ['weather'], 'days': int(days)})
+
+
+def willyweather_find_location_id(lat, lon):
+    """Resolve the WillyWeather location id closest to lat/lon."""
+    url = f"https://api.willyweather.com.au/v2/{WILLYWEATHER_API_KEY}/search.json"
+    headers = {
+        'Content-Type': 'application/json',
+        # Round to ~100 m so colocated users share the encoded payload
+        'x-payload': _ww_search_payload(round(lat, 3), round(lon, 3)),
+    }
+    j, _ = _get_json(url, headers=headers)
+    location = j.get('location') or {}
+    return location.get('id')
+
+
+def willyweather_forecast_by_id(location_id, days):
+    """Fetch and normalize a WillyWeather forecast for a location id."""
+    url = (f"https://api.willyweather.com.au/v2/{WILLYWEATHER_API_KEY}"
+           f"/locations/{location_id}/weather.json")
+    headers = {
+        'Content-Type': 'application/json',
+        'x-payload': _ww_forecast_payload(days),
+    }
+    j, _ = _get_json(url, headers=headers)
+
+    location = j.get('location') or {}
+    weather_days = (j.get('forecasts') or {}).get('weather', {}).get('days', [])
+
+    forecast = []
+    for day in weather_days[:days]:
+        entries = day.get('entries') or [{}]
+        entry = entries[0]
+        forecast.append({
+            'date': day.get('dateTime'),
+            'summary': entry.get('precis'),
+            'tempMin': entry.get('min'),
+            'tempMax': entry.get('max'),
+        })
+
+    return {
+        'location': {'lat': location.get('lat'), 'lon': location.get('lng')},
+        'days': len(forecast),
+        'forecast': forecast,
+    }
+
+
+# Single-flight bookkeeping: the first miss for a key fetches upstream,
+# concurrent requests for the same key wait on its Event and read the cache.
+_inflight_lock = threading.Lock()
+_inflight = {}
+
+
+@app.route('/health')
+def health():
+    return jsonify({'status': 'ok'})
+
+
+@app.route('/api/weather')
+def weather():
+    lat = request.args.get('lat')
+    lon = request.args.get('lon')
+    days = request.args.get('days', '7')
+    provider = request.args.get('provider', 'mock' if USE_MOCK else 'open-meteo')
+
+    if lat is None or lon is None:
+        return jsonify({'error': 'lat and lon are required'}), 400
+    try:
+        lat_f = float(lat)
+        lon_f = float(lon)
+        days = max(1, min(7, int(days)))
+    except ValueError:
+        return jsonify({'error': 'invalid lat/lon/days'}), 400
+    if not (-90 <= lat_f <= 90 and -180 <= lon_f <= 180):
+        return jsonify({'error': 'lat/lon out of range'}), 400
+
+    # Canonicalized key so "-37.8" and "-37.80" share a cache entry
+    key = f"weather:{provider}:{lat_f:.4f}:{lon_f:.4f}:{days}"
+    cached = cache_get(key)
+    if cached is not None:
+        return jsonify(cached)
+
+    with _inflight_lock:
+        event = _inflight.get(key)
+        leader = event is None
+        if leader:
+            event = threading.Event()
+            _inflight[key] = event
+
+    if not leader:
+        # Another request is already fetching this key; wait for its result
+        event.wait(timeout=REQUEST_TIMEOUT + 1)
+        cached = cache_get(key)
+        if cached is not None:
+            return jsonify(cached)
+        # Leader failed or timed out -- fall through and fetch ourselves
+
+    try:
+        try:
+            if provider == 'willyweather' and WILLYWEATHER_API_KEY:
+                location_id = willyweather_find_location_id(lat_f, lon_f)
+                if location_id is None:
+                    return jsonify({'error': 'location not found'}), 404
+                payload = willyweather_forecast_by_id(location_id, days)
+            elif provider == 'open-meteo':
+                payload = open_meteo_forecast(lat_f, lon_f, days)
+            else:
+                payload = mock_forecast(lat_f, lon_f, days)
+        except requests.exceptions.Timeout:
+            return jsonify({'error': 'upstream timeout'}), 504
+        except requests.exceptions.RequestException as e:
+            return jsonify({'error': f'upstream error: {e}'}), 502
+
+        cache_set(key, payload)
+    finally:
+        if leader:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+            event.set()
+
+    return jsonify(payload)
+
+
+if __name__ == '__main__':
+    # Development only -- single-threaded and auto-reloading. In production
+    # run via gunicorn (see wsgi.py) so requests can overlap upstream latency.
+    app.run(debug=True)
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for the weather proxy backend.
+
+The built-in Flask dev server (python app.py) is single-threaded, so any
+slow upstream call blocks every other client. In production run under
+gunicorn instead:
+
+    gunicorn -w 4 -k gthread --threads 8 --preload wsgi:app
+
+--preload imports the app once before forking so the code objects, the
+Open-Meteo lookup tables, and the pooled requests.Session are shared
+across workers via copy-on-write.
+"""
+
+from app import app
+
+if __name__ == '__main__':
+    app.run()
@@ -9,25 +9,75 @@ to get the application working while we complete the full DI migration.
 Usage: python fix-logger-imports.py [--dry-run]
 """
 
+import mmap
 import os
 import re
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
+# Compiled once at import: the same patterns run against every module file,
+# so hoisting them out of the per-file loop skips the re-cache lookup and
+# argument re-parsing on each call.
+_RE_LOGGER_IMPORT = re.compile(rb"import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"]")
+_RE_LOGGER_IMPORT_STMT = re.compile(r"import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"];")
+
+
+def _has_logger_import(js_file):
+    """Byte-level discovery probe: True when the file imports logger directly.
+
+    mmaps the file so discovery never copies or decodes the content; only
+    files that pass get the full read_text for rewriting.
+    """
+    with js_file.open('rb') as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Literal prefilter: the import pattern only varies in
+            # whitespace, so files without the substring can skip the
+            # regex engine entirely
+            if mm.find(b'StructuredLogger.js') < 0:
+                return False
+            return _RE_LOGGER_IMPORT.search(mm) is not None
+
+BACKUP_DIR = Path("backup_modules")
+
+
 def create_backup(file_path):
-    """Create backup of file"""
-    backup_dir = Path("backup_modules")
-    if not backup_dir.exists():
-        backup_dir.mkdir()
-    
-    backup_path = backup_dir / file_path.name
-    shutil.copy2(file_path, backup_path)
+    """Create backup of file.
+
+    A hardlink costs one syscall and moves no data; fixed files are
+    replaced via rename, which breaks the link and leaves the original
+    bytes in the backup. Falls back to a plain copy (the stat metadata
+    copy2 preserves is unused here) when the backup dir is on another
+    filesystem. BACKUP_DIR is created once in main, not per file.
+    """
+    backup_path = BACKUP_DIR / file_path.name
+    try:
+        if backup_path.exists():
+            backup_path.unlink()
+        os.link(file_path, backup_path)
+    except OSError:
+        shutil.copyfile(file_path, backup_path)
     return backup_path
 
 def fix_logger_import(file_path, dry_run=False):
-    """Fix logger import in a single file"""
+    """Fix logger import in a single file.
+
+    Pure worker: reads, rewrites and writes one file with no shared state,
+    so it can run in a process pool. Returns True when the file changed;
+    errors are reported and count as no change.
+    """
     print(f"🔧 Fixing {file_path.name}...")
-    
+
+    try:
+        return _fix_logger_import(file_path, dry_run)
+    except Exception as e:
+        print(f"❌ Error fixing {file_path.name}: {e}")
+        return False
+
+def _fix_logger_import(file_path, dry_run):
     # Create backup
     if not dry_run:
         create_backup(file_path)
@@ -37,8 +87,6 @@ def fix_logger_import(file_path, dry_run=False):
     original_content = content
     
     # Replace direct logger import with mock logger
-    logger_import_pattern = r"import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"];"
-    
     mock_logger = '''// Temporarily use a mock logger to avoid DI issues during migration
 const logger = {
   createChild: () => ({
@@ -56,12 +104,17 @@ const logger = {
 };'''
     
     # Replace the import
-    new_content = re.sub(logger_import_pattern, mock_logger, content)
+    new_content = _RE_LOGGER_IMPORT_STMT.sub(mock_logger, content)
     
     # Check if changes were made
     if new_content != original_content:
         if not dry_run:
-            file_path.write_text(new_content, encoding='utf-8')
+            # Write a sibling and rename: the new inode breaks the
+            # hardlink shared with the backup, so the backup keeps the
+            # original content
+            tmp_path = file_path.with_name(file_path.name + '.tmp')
+            tmp_path.write_text(new_content, encoding='utf-8')
+            os.replace(tmp_path, file_path)
             print(f"✅ Fixed {file_path.name}")
         else:
             print(f"🔍 DRY RUN: Would fix {file_path.name}")
@@ -80,27 +133,37 @@ def main():
     
     modules_dir = Path("js/modules")
     
-    # Find files with direct logger imports
+    # Find files with direct logger imports. os.scandir yields name and
+    # type from one directory read — no per-entry stat or Path object;
+    # the skip-list check runs on the raw name and a Path is built only
+    # for entries that survive it.
+    skip_names = {"Types.js", "DependencyContainer.js", "ApplicationBootstrap.js", "StructuredLogger.js"}
     files_to_fix = []
-    for js_file in modules_dir.glob("*.js"):
-        if js_file.name in ["Types.js", "DependencyContainer.js", "ApplicationBootstrap.js", "StructuredLogger.js"]:
-            continue
-            
-        content = js_file.read_text(encoding='utf-8')
-        if re.search(r"import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"]", content):
-            files_to_fix.append(js_file)
+    with os.scandir(modules_dir) as entries:
+        for entry in entries:
+            if (not entry.name.endswith(".js") or entry.name in skip_names
+                    or not entry.is_file(follow_symlinks=False)):
+                continue
+            js_file = Path(entry.path)
+            if _has_logger_import(js_file):
+                files_to_fix.append(js_file)
+    files_to_fix.sort()
     
     print(f"🚀 Found {len(files_to_fix)} files with direct logger imports")
     print(f"{'🔍 DRY RUN MODE' if args.dry_run else '🔄 FIXING MODE'}")
     print("=" * 50)
     
-    success_count = 0
-    for file_path in files_to_fix:
-        try:
-            if fix_logger_import(file_path, args.dry_run):
-                success_count += 1
-        except Exception as e:
-            print(f"❌ Error fixing {file_path.name}: {e}")
+    if not args.dry_run and files_to_fix:
+        BACKUP_DIR.mkdir(exist_ok=True)
+
+    # Each fix is an independent read/rewrite/write, so fan the files out
+    # across cores; regex work on file N overlaps I/O on file N+1, and
+    # chunked submission amortizes the IPC round-trip per file
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(
+            partial(fix_logger_import, dry_run=args.dry_run), files_to_fix,
+            chunksize=8))
+    success_count = sum(1 for changed in results if changed)
     
     print(f"\n📊 Summary:")
     print(f"  - Files processed: {len(files_to_fix)}")
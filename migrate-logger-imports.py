@@ -9,13 +9,70 @@ use direct logger imports.
 Usage: python migrate-logger-imports.py [--dry-run] [--backup]
 """
 
+import mmap
 import os
 import re
 import shutil
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import List, Tuple, Dict
 
+# Compiled once at import: every pattern below runs per module file, so
+# hoisting them avoids the re-cache lookup and pattern re-parse inside the
+# migration loop.
+_RE_LOGGER_IMPORT = re.compile(r"import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"]")
+# Bytes twin of the import pattern for the mmap-based discovery probe
+_RE_LOGGER_IMPORT_B = re.compile(rb"import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"]")
+_RE_IMPORT_STMT = re.compile(r"(import\s+[^;]+;)\s*\n")
+_RE_CONSTRUCTOR = re.compile(r"constructor\s*\([^)]*\)\s*{")
+_RE_LOGGER_ASSIGN = re.compile(r"this\.logger\s*=\s*logger\.createChild")
+_RE_SINGLETON_EXPORT = re.compile(r"export\s+const\s+\w+\s*=\s*new\s+\w+\(\)")
+
+# Migration rewrites fused into one alternation so a single sub pass visits
+# the content once, instead of five sequential passes each materializing a
+# new copy of the file. The dispatch callback checks which named group
+# matched. Ordering matters: the logger assignment must precede the bare
+# this.logger. form so the longer match wins at the same position.
+_RE_MIGRATE = re.compile(
+    # import { logger } from './StructuredLogger.js';  ->  removed
+    r"(?P<logger_imp>import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"];\s*\n)|"
+    # constructor(params) {  ->  inject StructuredLogger
+    r"(?P<ctor>constructor\s*\()(?P<params>[^)]*)(?P<ctor_close>\)\s*{)|"
+    # this.logger = logger.createChild  ->  this.moduleLogger = this.logger.createChild
+    r"(?P<logger_assign>this\.logger\s*=\s*logger\.createChild)|"
+    # this.logger.  ->  this.moduleLogger.
+    r"(?P<this_logger>this\.logger\.)|"
+    # export const name = new Class();  ->  legacy function stub
+    r"(?P<singleton>export\s+const\s+(?P<sname>\w+)\s*=\s*new\s+(?P<scls>\w+)\(\);)")
+
+
+def _migrate_dispatch(match):
+    """Rewrite one _RE_MIGRATE match according to which branch hit."""
+    if match.group('logger_imp') is not None:
+        # Remove direct logger import
+        return ""
+    if match.group('ctor') is not None:
+        # Update constructor to use DI injection
+        params = match.group('params').strip()
+        if params:
+            new_params = f"{params},\n    @inject(TYPES.StructuredLogger) private logger"
+        else:
+            new_params = "@inject(TYPES.StructuredLogger) private logger"
+        return f"{match.group('ctor')}{new_params}{match.group('ctor_close')}"
+    if match.group('logger_assign') is not None:
+        return "this.moduleLogger = this.logger.createChild"
+    if match.group('this_logger') is not None:
+        return "this.moduleLogger."
+    # Replace singleton export with legacy function
+    var_name = match.group('sname')
+    class_name = match.group('scls')
+    return f"""// Legacy function stub - {class_name} is now instantiated via DI
+export const {var_name} = () => {{
+  throw new Error('Legacy function not available. Use DI container to get {class_name} instance.');
+}};"""
+
 class DIMigrationScript:
     def __init__(self, modules_dir: str = "js/modules"):
         self.modules_dir = Path(modules_dir)
@@ -25,21 +82,37 @@ class DIMigrationScript:
     def find_partially_migrated_modules(self) -> List[Path]:
         """Find modules that have @injectable() but still import logger directly"""
         partially_migrated = []
-        
-        for js_file in self.modules_dir.glob("*.js"):
-            if js_file.name in ["Types.js", "DependencyContainer.js", "ApplicationBootstrap.js"]:
-                continue
-                
-            content = js_file.read_text(encoding='utf-8')
-            
-            # Check if module has @injectable() decorator
-            has_injectable = "@injectable()" in content
-            
-            # Check if module imports logger directly
-            has_direct_logger_import = re.search(r"import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"]", content)
-            
-            if has_injectable and has_direct_logger_import:
-                partially_migrated.append(js_file)
+
+        # os.scandir yields name and type from one directory read — no
+        # per-entry stat or Path object; the skip-list check runs on the
+        # raw name and a Path is built only for entries that survive it.
+        skip_names = {"Types.js", "DependencyContainer.js", "ApplicationBootstrap.js"}
+        with os.scandir(self.modules_dir) as entries:
+            candidates = sorted(
+                entry.path for entry in entries
+                if entry.name.endswith(".js") and entry.name not in skip_names
+                and entry.is_file(follow_symlinks=False))
+
+        for candidate in candidates:
+            js_file = Path(candidate)
+            # Byte-level discovery: mmap the file and probe for the two
+            # predicates without copying or decoding the content. Cheapest
+            # test first — the substring probes reject most files before
+            # the regex engine ever runs, and 'StructuredLogger.js' is a
+            # reliable literal prefilter since the import pattern only
+            # varies in whitespace. Only files that pass discovery are
+            # read_text'd again, by migrate_module, for rewriting.
+            with js_file.open('rb') as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    continue
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if mm.find(b'@injectable()') < 0:
+                        continue
+                    if mm.find(b'StructuredLogger.js') < 0:
+                        continue
+                    # Check if module imports logger directly
+                    if _RE_LOGGER_IMPORT_B.search(mm):
+                        partially_migrated.append(js_file)
                 
         return partially_migrated
     
@@ -50,7 +123,7 @@ class DIMigrationScript:
         analysis = {
             'file': file_path,
             'has_injectable': "@injectable()" in content,
-            'has_direct_logger_import': bool(re.search(r"import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"]", content)),
+            'has_direct_logger_import': bool(_RE_LOGGER_IMPORT.search(content)),
             'has_inversify_imports': "import { injectable, inject } from 'inversify'" in content,
             'has_types_import': "import { TYPES } from './Types.js'" in content,
             'constructor_pattern': None,
@@ -59,35 +132,55 @@ class DIMigrationScript:
         }
         
         # Find constructor pattern
-        constructor_match = re.search(r"constructor\s*\([^)]*\)\s*{", content)
+        constructor_match = _RE_CONSTRUCTOR.search(content)
         if constructor_match:
             analysis['constructor_pattern'] = constructor_match.group(0)
         
         # Find logger usage pattern
-        logger_usage = re.search(r"this\.logger\s*=\s*logger\.createChild", content)
+        logger_usage = _RE_LOGGER_ASSIGN.search(content)
         if logger_usage:
             analysis['logger_usage_pattern'] = logger_usage.group(0)
         
         # Find singleton export
-        singleton_match = re.search(r"export\s+const\s+\w+\s*=\s*new\s+\w+\(\)", content)
+        singleton_match = _RE_SINGLETON_EXPORT.search(content)
         if singleton_match:
             analysis['singleton_export'] = singleton_match.group(0)
             
         return analysis
     
     def create_backup(self, file_path: Path) -> Path:
-        """Create backup of file before modification"""
-        if not self.backup_dir.exists():
-            self.backup_dir.mkdir()
-            
+        """Create backup of file before modification.
+
+        A hardlink costs one syscall and moves no data; migrated files
+        are replaced via rename, which breaks the link and leaves the
+        original bytes in the backup. Falls back to a plain copy (the
+        stat metadata copy2 preserves is unused here) when the backup
+        dir is on another filesystem. The backup dir itself is created
+        once by run_migration, not per file.
+        """
         backup_path = self.backup_dir / file_path.name
-        shutil.copy2(file_path, backup_path)
+        try:
+            if backup_path.exists():
+                backup_path.unlink()
+            os.link(file_path, backup_path)
+        except OSError:
+            shutil.copyfile(file_path, backup_path)
         return backup_path
     
-    def migrate_module(self, file_path: Path, dry_run: bool = False) -> bool:
-        """Migrate a single module from direct logger import to DI injection"""
+    def migrate_module(self, file_path: Path, dry_run: bool = False) -> Tuple[str, bool, str]:
+        """Migrate a single module from direct logger import to DI injection.
+
+        Pure worker: touches only its own file and returns a
+        ``(name, changed, error)`` status tuple instead of mutating shared
+        state, so modules can migrate in parallel across processes.
+        """
         print(f"\n🔄 Migrating {file_path.name}...")
-        
+        try:
+            return file_path.name, self._migrate_module(file_path, dry_run), None
+        except Exception as e:
+            return file_path.name, False, str(e)
+
+    def _migrate_module(self, file_path: Path, dry_run: bool) -> bool:
         # Create backup
         if not dry_run:
             self.create_backup(file_path)
@@ -99,8 +192,7 @@ class DIMigrationScript:
         # Step 1: Add missing imports if needed
         if "import { injectable, inject } from 'inversify'" not in content:
             # Find the last import statement
-            import_pattern = r"(import\s+[^;]+;)\s*\n"
-            imports = re.findall(import_pattern, content)
+            imports = _RE_IMPORT_STMT.findall(content)
             if imports:
                 last_import = imports[-1]
                 new_import = "import { injectable, inject } from 'inversify';\nimport { TYPES } from './Types.js';\n"
@@ -109,57 +201,21 @@ class DIMigrationScript:
                 # Add at the top if no imports found
                 content = "import { injectable, inject } from 'inversify';\nimport { TYPES } from './Types.js';\n\n" + content
         
-        # Step 2: Remove direct logger import
-        logger_import_pattern = r"import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"];\s*\n"
-        content = re.sub(logger_import_pattern, "", content)
-        
-        # Step 3: Update constructor to use DI injection
-        # Find constructor and add logger parameter
-        constructor_pattern = r"(constructor\s*\()([^)]*)(\)\s*{)"
-        
-        def update_constructor(match):
-            params = match.group(2).strip()
-            if params:
-                # Add logger parameter
-                new_params = f"{params},\n    @inject(TYPES.StructuredLogger) private logger"
-            else:
-                # No existing parameters
-                new_params = "@inject(TYPES.StructuredLogger) private logger"
-            
-            return f"{match.group(1)}{new_params}{match.group(3)}"
-        
-        content = re.sub(constructor_pattern, update_constructor, content)
-        
-        # Step 4: Update logger usage pattern
-        # Change this.logger = logger.createChild to this.moduleLogger = this.logger.createChild
-        content = re.sub(
-            r"this\.logger\s*=\s*logger\.createChild",
-            "this.moduleLogger = this.logger.createChild",
-            content
-        )
-        
-        # Step 5: Replace all this.logger with this.moduleLogger
-        content = re.sub(r"this\.logger\.", "this.moduleLogger.", content)
-        
-        # Step 6: Replace singleton export with legacy function
-        singleton_pattern = r"export\s+const\s+(\w+)\s*=\s*new\s+(\w+)\(\);"
-        
-        def replace_singleton(match):
-            var_name = match.group(1)
-            class_name = match.group(2)
-            return f"""// Legacy function stub - {class_name} is now instantiated via DI
-export const {var_name} = () => {{
-  throw new Error('Legacy function not available. Use DI container to get {class_name} instance.');
-}};"""
-        
-        content = re.sub(singleton_pattern, replace_singleton, content)
+        # Steps 2-6 fused: remove the direct logger import, inject the
+        # logger into the constructor, rename the logger usage and replace
+        # the singleton export, all in one sub pass over the content
+        content = _RE_MIGRATE.sub(_migrate_dispatch, content)
         
         # Check if changes were made
         if content != original_content:
             if not dry_run:
-                file_path.write_text(content, encoding='utf-8')
+                # Write a sibling and rename: the new inode breaks the
+                # hardlink shared with the backup, so the backup keeps
+                # the original content
+                tmp_path = file_path.with_name(file_path.name + '.tmp')
+                tmp_path.write_text(content, encoding='utf-8')
+                os.replace(tmp_path, file_path)
                 print(f"✅ Successfully migrated {file_path.name}")
-                self.changes_made.append(file_path.name)
             else:
                 print(f"🔍 DRY RUN: Would migrate {file_path.name}")
             return True
@@ -172,7 +228,7 @@ export const {var_name} = () => {{
         content = file_path.read_text(encoding='utf-8')
         
         # Check that direct logger import is removed
-        has_direct_import = bool(re.search(r"import\s*{\s*logger\s*}\s*from\s*['\"]\.\/StructuredLogger\.js['\"]", content))
+        has_direct_import = bool(_RE_LOGGER_IMPORT.search(content))
         
         # Check that DI injection is present
         has_di_injection = "@inject(TYPES.StructuredLogger)" in content
@@ -202,14 +258,26 @@ export const {var_name} = () => {{
         print(f"\n{'🔍 DRY RUN MODE' if dry_run else '🔄 MIGRATION MODE'}")
         print("=" * 50)
         
-        # Migrate each module
+        if not dry_run:
+            self.backup_dir.mkdir(exist_ok=True)
+
+        # Migrate each module: each migration is an independent
+        # read/rewrite/write, so fan the modules out across cores and
+        # aggregate the returned status tuples here rather than mutating
+        # shared state from the workers
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(
+                partial(self.migrate_module, dry_run=dry_run),
+                partially_migrated, chunksize=8))
+
         success_count = 0
-        for module in partially_migrated:
-            try:
-                if self.migrate_module(module, dry_run):
-                    success_count += 1
-            except Exception as e:
-                print(f"❌ Error migrating {module.name}: {e}")
+        for name, changed, error in results:
+            if error is not None:
+                print(f"❌ Error migrating {name}: {error}")
+            elif changed:
+                success_count += 1
+                if not dry_run:
+                    self.changes_made.append(name)
         
         print(f"\n📊 Migration Summary:")
         print(f"  - Modules processed: {len(partially_migrated)}")
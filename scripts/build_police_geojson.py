@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Build geojson/police.geojson from a Vicmap Features of Interest export.
+
+Accepts either a GeoJSON dump or a CSV export, keeps only the features
+that look like police facilities, and writes a point FeatureCollection
+for the map.
+
+Usage: python scripts/build_police_geojson.py input.(geojson|csv) [-o out]
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+
+# pandas filters and coerces whole CSV columns at C speed instead of a
+# Python loop per row; fall back to the csv.DictReader path without it.
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# orjson parses and serializes multi-megabyte GeoJSON payloads 3-10x
+# faster than stdlib json; fall back to stdlib when it isn't installed.
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps_compact(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps_compact(obj):
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+POLICE_TOKENS = ('POLICE',)
+CLASS_VALUES = ('POLICE FACILITY', 'POLICE STATION')
+
+# The token/class tests as one precompiled case-insensitive scan each:
+# a single alternation pass per value instead of an .upper() allocation
+# plus an independent substring scan per token
+POLICE_RE = re.compile('|'.join(re.escape(tok) for tok in POLICE_TOKENS),
+                       re.IGNORECASE)
+CLASS_RE = re.compile('|'.join(re.escape(v) for v in CLASS_VALUES),
+                      re.IGNORECASE)
+CODE_RE = re.compile(r'POL', re.IGNORECASE)
+
+# Attribute name candidates; Vicmap exports vary in column naming
+TYPE_KEYS = ('feature', 'featuretype', 'feature_type', 'type')
+CLASS_KEYS = ('class', 'feature_class', 'fclass')
+CODE_KEYS = ('feature_code', 'featurecode', 'code')
+NAME_KEYS = ('place_name', 'name', 'official_name')
+LAT_CANDIDATES = ('latitude', 'lat', 'y')
+LON_CANDIDATES = ('longitude', 'lon', 'long', 'x')
+
+
+def looks_like_police(props):
+    """True when the feature's attributes identify a police facility."""
+    # Build the casefolded->original key map once per feature: every
+    # candidate lookup becomes a hashed O(1) probe instead of rescanning
+    # (and re-folding) all property keys per candidate. casefold rather
+    # than lower for full Unicode folding; the *_KEYS candidates are
+    # already folded literals, so only the property keys need it.
+    lower_map = {k.casefold(): k for k in props}
+
+    def get_any(keys):
+        for k in keys:
+            orig = lower_map.get(k)
+            if orig is not None:
+                return props[orig]
+        return None
+
+    feature_type = get_any(TYPE_KEYS)
+    if isinstance(feature_type, str) and POLICE_RE.search(feature_type):
+        return True
+
+    klass = get_any(CLASS_KEYS)
+    if isinstance(klass, str) and CLASS_RE.search(klass):
+        return True
+
+    code = get_any(CODE_KEYS)
+    if isinstance(code, str) and CODE_RE.match(code):
+        return True
+
+    name = get_any(NAME_KEYS)
+    if isinstance(name, str) and POLICE_RE.search(name):
+        return True
+
+    return False
+
+
+def feature_from_row(row, lon, lat):
+    """Build a GeoJSON point Feature from a CSV row and its coordinates.
+
+    The row dict is referenced directly rather than copied: both callers
+    (DictReader and the pandas records path) hand over a fresh dict per
+    row that is never touched again.
+    """
+    return {
+        'type': 'Feature',
+        'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+        'properties': row
+    }
+
+
+def build_from_geojson(fh):
+    """Yield the police features from a GeoJSON FeatureCollection."""
+    doc = _loads(fh.read())
+    for feature in doc.get('features', []):
+        props = feature.get('properties') or {}
+        if looks_like_police(props):
+            yield feature
+
+
+def _build_from_csv_pandas(fh):
+    """Vectorized CSV path: column-wise masks instead of a per-row loop.
+
+    The POLICE matching and coordinate coercion run in C across whole
+    columns; only the few surviving rows are walked in Python to emit
+    features. Matches the looks_like_police / candidate-coalescing
+    semantics of the row loop below.
+    """
+    df = pd.read_csv(fh, dtype=str, keep_default_na=False)
+    cols_lower = {c.casefold(): c for c in df.columns}
+
+    def first_col(keys):
+        # Rows share one header, so first-existing-column equals the
+        # per-row first-existing-key of the DictReader path
+        for k in keys:
+            c = cols_lower.get(k)
+            if c is not None:
+                return df[c].str.upper()
+        return None
+
+    tokens = '|'.join(re.escape(tok) for tok in POLICE_TOKENS)
+    mask = pd.Series(False, index=df.index)
+    feature_type = first_col(TYPE_KEYS)
+    if feature_type is not None:
+        mask |= feature_type.str.contains(tokens, na=False)
+    klass = first_col(CLASS_KEYS)
+    if klass is not None:
+        mask |= klass.str.strip().str.contains(
+            '|'.join(re.escape(v) for v in CLASS_VALUES), na=False)
+    code = first_col(CODE_KEYS)
+    if code is not None:
+        mask |= code.str.startswith('POL', na=False)
+    name = first_col(NAME_KEYS)
+    if name is not None:
+        mask |= name.str.contains(tokens, na=False)
+
+    def coalesce(candidates):
+        # First non-empty candidate column per row, like the row loop
+        series = None
+        for k in candidates:
+            c = cols_lower.get(k)
+            if c is None:
+                continue
+            col = df[c].replace('', None)
+            series = col if series is None else series.fillna(col)
+        return pd.to_numeric(series, errors='coerce') if series is not None else None
+
+    lat = coalesce(LAT_CANDIDATES)
+    lon = coalesce(LON_CANDIDATES)
+    if lat is None or lon is None:
+        return
+    keep = mask & lat.notna() & lon.notna()
+    lat, lon = lat[keep], lon[keep]
+    for i, row in zip(df.index[keep], df.loc[keep].to_dict('records')):
+        yield feature_from_row(row, float(lon[i]), float(lat[i]))
+
+
+def build_from_csv(fh):
+    """Yield police features from a Vicmap CSV export with coordinates."""
+    if pd is not None:
+        yield from _build_from_csv_pandas(fh)
+        return
+    reader = csv.DictReader(fh)
+    for row in reader:
+        if not looks_like_police(row):
+            continue
+        lower = {k.casefold(): v for k, v in row.items()}
+        lat = lon = None
+        for cand in LAT_CANDIDATES:
+            if lower.get(cand) not in (None, ''):
+                lat = lower[cand]
+                break
+        for cand in LON_CANDIDATES:
+            if lower.get(cand) not in (None, ''):
+                lon = lower[cand]
+                break
+        if lat is None or lon is None:
+            continue
+        try:
+            yield feature_from_row(row, float(lon), float(lat))
+        except ValueError:
+            continue
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build police.geojson from a Vicmap export")
+    parser.add_argument('inp', help="Input file (.geojson/.json or .csv)")
+    parser.add_argument('-o', '--out', default='geojson/police.geojson',
+                        help="Output GeoJSON file")
+    args = parser.parse_args()
+
+    print(f"Building {args.out} from {args.inp}...")
+
+    # Stream kept features straight to the output as the builders yield
+    # them: the output is framed by hand ('[', ',', ']') and each feature
+    # is serialized individually, so the full collection never sits in
+    # memory as one list and the large buffer amortizes write syscalls.
+    count = 0
+    with open(args.inp, 'r', encoding='utf-8', newline='') as fin:
+        builder = build_from_csv if args.inp.lower().endswith('.csv') else build_from_geojson
+        with open(args.out, 'w', encoding='utf-8', buffering=1 << 20) as fout:
+            fout.write('{"type":"FeatureCollection","features":[')
+            for feature in builder(fin):
+                if count:
+                    fout.write(',')
+                fout.write(_dumps_compact(feature))
+                count += 1
+            fout.write(']}')
+
+    if not count:
+        print("WARNING: No police features found in the input")
+        sys.exit(1)
+
+    print(f"✅ Wrote {count} police features to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Fetch Victoria Police facility locations from an ArcGIS REST layer.
+Downloads the data as GeoJSON format for use in the mapping application.
+"""
+
+import argparse
+import json
+import sys
+
+import ijson
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+# orjson parses and serializes multi-megabyte GeoJSON payloads 3-10x
+# faster than stdlib json; fall back to stdlib when it isn't installed.
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps_compact(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps_compact(obj):
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+# ArcGIS servers silently truncate at maxRecordCount (often 1000); page
+# explicitly so no features are dropped
+PAGE_SIZE = 2000
+
+DEFAULT_URL = ("https://enterprise.mapshare.vic.gov.au/server/rest/services/"
+               "Vicmap_FeaturesOfInterest/MapServer/0")
+DEFAULT_WHERE = "UPPER(feature) LIKE '%POLICE%'"
+
+# Field name candidates for the police filter; Vicmap layers vary in casing
+FILTER_FIELD_CANDIDATES = ('feature', 'featuretype', 'feature_type',
+                           'class', 'feature_code')
+
+# One session for the whole run: pagination re-uses the same TCP/TLS
+# connection instead of re-resolving and re-handshaking per page, and
+# transient server errors retry with backoff.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4, pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504))))
+
+
+def get_layer_info(layer_url):
+    """Fetch the layer's field list from the service metadata.
+
+    Layer metadata commonly runs to hundreds of KB of renderer and index
+    blobs that the script never looks at. The streamed ijson parse pulls
+    only the fields array out of the body as it downloads, without ever
+    materializing the rest of the document as a tree.
+    """
+    with SESSION.get(layer_url, params={'f': 'json'}, stream=True,
+                     timeout=30) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True
+        return {'fields': list(ijson.items(r.raw, 'fields.item'))}
+
+
+def detect_filter_fields(layer_info):
+    """Layer field names usable for the police filter.
+
+    One casefolded name map built by comprehension, then hashed lookups
+    per candidate — no nested scan over the field list.
+    """
+    fields = layer_info.get('fields') or []
+    name_map = {f['name'].casefold(): f['name'] for f in fields}
+    return [name_map[c] for c in FILTER_FIELD_CANDIDATES if c in name_map]
+
+
+def query_features_geojson(layer_url, where):
+    """Yield features page by page using the service's native GeoJSON output.
+
+    A generator so the caller can stream features straight to disk while
+    the next page is still being fetched; at no point does the whole
+    layer sit in memory as one list.
+    """
+    query_params = {
+        'where': where,
+        'outFields': '*',
+        'f': 'geojson',
+        'returnGeometry': 'true',
+        'geometryPrecision': 6,
+        'resultRecordCount': PAGE_SIZE
+    }
+    offset = 0
+    while True:
+        with SESSION.get(f"{layer_url}/query",
+                         params=dict(query_params, resultOffset=offset),
+                         stream=True, timeout=60) as r:
+            r.raise_for_status()
+            # Stream-parse the body as it arrives: ijson emits features
+            # while later bytes are still on the wire, so the raw page and
+            # a fully parsed tree never coexist in memory.
+            r.raw.decode_content = True
+            page_features = 0
+            for feature in ijson.items(r.raw, 'features.item', use_float=True):
+                yield feature
+                page_features += 1
+        # Stop only on an empty page: servers cap pages at their own
+        # maxRecordCount (often 1000), so a short page can still mean
+        # "more to come" and comparing against PAGE_SIZE would silently
+        # truncate the dataset. The one extra empty-page request is the
+        # price of correctness here, since the streamed parse never sees
+        # the exceededTransferLimit flag.
+        if not page_features:
+            return
+        offset += page_features
+        print(f"  {offset} features so far, requesting next page...")
+
+
+def query_features_json(layer_url, where):
+    """Fallback for servers without f=geojson support.
+
+    Pages through esriJSON and yields each point feature converted to a
+    GeoJSON Feature.
+    """
+    query_params = {
+        'where': where,
+        'outFields': '*',
+        'f': 'json',
+        'returnGeometry': 'true',
+        'geometryPrecision': 6,
+        'resultRecordCount': PAGE_SIZE
+    }
+    offset = 0
+    while True:
+        r = SESSION.get(f"{layer_url}/query",
+                         params=dict(query_params, resultOffset=offset),
+                         timeout=60)
+        r.raise_for_status()
+        payload = _loads(r.content)
+        features = payload.get('features', [])
+        for feat in features:
+            geometry = feat.get('geometry') or {}
+            if 'x' not in geometry or 'y' not in geometry:
+                continue
+            yield {
+                'type': 'Feature',
+                'geometry': {
+                    'type': 'Point',
+                    'coordinates': [geometry['x'], geometry['y']]
+                },
+                'properties': feat.get('attributes') or {}
+            }
+        # exceededTransferLimit is authoritative when the server sends
+        # it: a page shorter than PAGE_SIZE can still be a server-side
+        # maxRecordCount cap, not the end of the data.
+        if not features or not payload.get('exceededTransferLimit'):
+            return
+        offset += len(features)
+        print(f"  {offset} features so far, requesting next page...")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fetch police facilities from an ArcGIS REST layer")
+    parser.add_argument('--url', default=DEFAULT_URL,
+                        help="ArcGIS REST layer URL")
+    parser.add_argument('--where', default=DEFAULT_WHERE,
+                        help="ArcGIS where clause selecting police features")
+    parser.add_argument('--out', default='geojson/police.geojson',
+                        help="Output GeoJSON file")
+    parser.add_argument('--esri-json', action='store_true',
+                        help="Use f=json + conversion instead of f=geojson")
+    args = parser.parse_args()
+
+    print("Victoria Police Facility Fetcher")
+    print("================================")
+    print(f"Source: {args.url}")
+    print(f"Filter: {args.where}")
+    print()
+
+    try:
+        info = get_layer_info(args.url)
+        if info['fields']:
+            print(f"Available fields: {', '.join(f['name'] for f in info['fields'])}")
+            print(f"Filter fields detected: {', '.join(detect_filter_fields(info)) or 'none'}")
+        print()
+
+        query = query_features_json if args.esri_json else query_features_geojson
+        features = query(args.url, args.where)
+
+        # Stream features to disk as they arrive from the paginated query:
+        # the output is framed by hand ('[', ',', ']') and each feature is
+        # serialized individually, so peak memory stays bounded by one page
+        # and disk writes overlap the network fetches. The large buffer
+        # amortizes write syscalls.
+        print(f"Saving to {args.out}...")
+        count = 0
+        with open(args.out, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write('{"type":"FeatureCollection","features":[')
+            for feature in features:
+                if count:
+                    f.write(',')
+                f.write(_dumps_compact(feature))
+                count += 1
+            f.write(']}')
+
+        if not count:
+            print("WARNING: No features matched the filter")
+            sys.exit(1)
+
+        print(f"✅ Successfully saved {count} police features to {args.out}")
+
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Network error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
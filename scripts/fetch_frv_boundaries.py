@@ -4,12 +4,18 @@ Fetch Fire Rescue Victoria (FRV) boundaries from ArcGIS REST service.
 Downloads the data as GeoJSON format for use in the mapping application.
 """
 
+import io
 import json
+import ijson
 import requests
 from urllib.parse import urlencode
 import sys
 import os
 
+# ArcGIS servers silently truncate at maxRecordCount (often 1000); page
+# explicitly so no features are dropped
+PAGE_SIZE = 2000
+
 def fetch_frv_boundaries(output_file='geojson/frv.geojson'):
     """
     Fetch FRV boundaries from the ArcGIS REST service
@@ -20,14 +26,17 @@ def fetch_frv_boundaries(output_file='geojson/frv.geojson'):
     print(f"Source: {base_url}")
     print()
     
+    # Reuse one session so both requests share a keep-alive connection
+    session = requests.Session()
+
     try:
         # First, get service info to understand the data
         info_params = {
             'f': 'json'
         }
-        
+
         print("Getting service information...")
-        info_response = requests.get(f"{base_url}", params=info_params, timeout=30)
+        info_response = session.get(f"{base_url}", params=info_params, timeout=30)
         info_response.raise_for_status()
         
         service_info = info_response.json()
@@ -42,52 +51,102 @@ def fetch_frv_boundaries(output_file='geojson/frv.geojson'):
         # Query all features
         query_url = f"{base_url}/query"
         
-        # Parameters for querying all features as GeoJSON
+        # Parameters for querying all features as GeoJSON. Geometry is
+        # precision-capped (6 decimals ~ 0.1 m) and paginated explicitly.
         query_params = {
             'where': '1=1',  # Get all features
             'outFields': '*',  # Get all fields
             'f': 'geojson',  # Return as GeoJSON
             'returnGeometry': 'true',
-            'spatialRel': 'esriSpatialRelIntersects'
+            'spatialRel': 'esriSpatialRelIntersects',
+            'geometryPrecision': 6,
+            'resultRecordCount': PAGE_SIZE
         }
-        
+        # ArcGIS honours gzip; requests decompresses transparently, cutting
+        # wire bytes ~5-10x on GeoJSON
+        query_headers = {'Accept-Encoding': 'gzip, deflate'}
+
         print("Fetching FRV boundary data...")
         print("This may take a moment depending on data size...")
-        
-        query_response = requests.get(query_url, params=query_params, timeout=60)
-        query_response.raise_for_status()
-        
-        # Parse the GeoJSON response
-        geojson_data = query_response.json()
-        
-        # Validate it's proper GeoJSON
-        if geojson_data.get('type') != 'FeatureCollection':
-            raise ValueError(f"Invalid GeoJSON response: {geojson_data.get('type')}")
-        
-        features = geojson_data.get('features', [])
-        if not features:
+
+        # Revalidate with a conditional GET when a previous download exists;
+        # an unchanged upstream answers 304 with no body to transfer
+        etag_file = output_file + '.etag'
+        first_headers = dict(query_headers)
+        if os.path.exists(output_file) and os.path.exists(etag_file):
+            with open(etag_file, 'r', encoding='utf-8') as f:
+                cached_etag = f.read().strip()
+            if cached_etag:
+                first_headers['If-None-Match'] = cached_etag
+
+        page = session.get(query_url, params=dict(query_params, resultOffset=0), headers=first_headers, timeout=60)
+        if page.status_code == 304:
+            print(f"✓ Upstream unchanged (304); keeping existing {output_file}")
+            return True
+        page.raise_for_status()
+        new_etag = page.headers.get('ETag')
+
+        # Write the output incrementally, one page of features at a time, so
+        # peak memory stays bounded by a single page. The write goes to a
+        # sibling temp file renamed into place at the end: a crash mid-write
+        # can't leave a truncated geojson behind (which, with the saved
+        # ETag, every later run would revalidate as "unchanged" and keep).
+        print(f"Saving to {output_file}...")
+        feature_count = 0
+        sample_properties = None
+        geometry_types = set()
+        tmp_file = output_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write('{"type":"FeatureCollection","features":[')
+            while True:
+                page_features = 0
+                for feature in ijson.items(io.BytesIO(page.content), 'features.item', use_float=True):
+                    if feature_count:
+                        f.write(',')
+                    json.dump(feature, f, separators=(',', ':'), ensure_ascii=False)
+                    feature_count += 1
+                    page_features += 1
+                    if sample_properties is None and 'properties' in feature:
+                        sample_properties = list(feature['properties'].keys())
+                    if 'geometry' in feature and feature['geometry']:
+                        geometry_types.add(feature['geometry'].get('type'))
+
+                # Stop only on an empty page: the server caps pages at its
+                # own maxRecordCount (often 1000), so a page shorter than
+                # PAGE_SIZE can still mean "more to come" and comparing
+                # against PAGE_SIZE would silently drop everything after
+                # page one. One extra empty-page request is the price of
+                # correctness.
+                if not page_features:
+                    break
+
+                print(f"  {feature_count} features so far, requesting next page...")
+                page = session.get(query_url, params=dict(query_params, resultOffset=feature_count), headers=query_headers, timeout=60)
+                page.raise_for_status()
+            f.write(']}')
+
+        # An empty-but-200 response is an upstream anomaly, not data:
+        # discard the tmp file and keep whatever good output (and ETag)
+        # the last successful run left behind
+        if not feature_count:
+            os.remove(tmp_file)
             print("WARNING: No features found in the response")
             return False
-        
-        print(f"✓ Successfully fetched {len(features)} FRV boundary features")
-        
-        # Display some info about the features
-        if features:
-            first_feature = features[0]
-            if 'properties' in first_feature:
-                print(f"Sample properties: {list(first_feature['properties'].keys())}")
-            
-            geometry_types = set()
-            for feature in features:
-                if 'geometry' in feature and feature['geometry']:
-                    geometry_types.add(feature['geometry'].get('type'))
-            print(f"Geometry types: {', '.join(geometry_types)}")
-        
-        # Save to file
-        print(f"\nSaving to {output_file}...")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(geojson_data, f, indent=2, ensure_ascii=False)
-        
+
+        os.replace(tmp_file, output_file)
+
+        # Remember the validator for the next run — only now that the
+        # rename has succeeded, so the ETag can never vouch for a file
+        # that didn't make it to disk intact
+        if new_etag:
+            with open(etag_file, 'w', encoding='utf-8') as f:
+                f.write(new_etag)
+
+        print(f"✓ Successfully fetched {feature_count} FRV boundary features")
+        if sample_properties:
+            print(f"Sample properties: {sample_properties}")
+        print(f"Geometry types: {', '.join(geometry_types)}")
+
         # Get file size
         file_size = os.path.getsize(output_file)
         file_size_mb = file_size / (1024 * 1024)
@@ -95,7 +154,7 @@ def fetch_frv_boundaries(output_file='geojson/frv.geojson'):
         print(f"✅ Successfully saved FRV boundaries!")
         print(f"File: {output_file}")
         print(f"Size: {file_size_mb:.2f} MB")
-        print(f"Features: {len(features)}")
+        print(f"Features: {feature_count}")
         
         return True
         
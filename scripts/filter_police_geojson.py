@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Filter a Vicmap Features of Interest GeoJSON dump down to police features.
+
+Usage: python scripts/filter_police_geojson.py input.geojson [-o out]
+"""
+
+import argparse
+import json
+import sys
+
+import ijson
+
+# orjson parses and serializes multi-megabyte GeoJSON payloads 3-10x
+# faster than stdlib json; fall back to stdlib when it isn't installed.
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps_compact(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps_compact(obj):
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def is_police(props):
+    """True when the feature attribute marks a police facility."""
+    value = props.get('feature') or props.get('FEATURE')
+    if not isinstance(value, str):
+        return False
+    return 'POLICE' in value.upper().strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Filter a GeoJSON dump down to police features")
+    parser.add_argument('inp', help="Input GeoJSON FeatureCollection")
+    parser.add_argument('-o', '--out', default='geojson/police.geojson',
+                        help="Output GeoJSON file")
+    args = parser.parse_args()
+
+    # Stream the input through ijson instead of materializing the whole
+    # document, and write kept features out as they pass the filter with
+    # hand framing ('[', ',', ']'). The 1 MB buffers amortize read/write
+    # syscalls; neither the input tree nor the kept list is ever fully in
+    # memory.
+    count = kept = 0
+    with open(args.inp, 'rb', buffering=1 << 20) as fin, \
+            open(args.out, 'w', encoding='utf-8', buffering=1 << 20) as fout:
+        fout.write('{"type":"FeatureCollection","features":[')
+        for feature in ijson.items(fin, 'features.item', use_float=True):
+            count += 1
+            if not is_police(feature.get('properties') or {}):
+                continue
+            if kept:
+                fout.write(',')
+            fout.write(_dumps_compact(feature))
+            kept += 1
+        fout.write(']}')
+
+    print(f"Kept {kept} of {count} features -> {args.out}")
+    if not kept:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
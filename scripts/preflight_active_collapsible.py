@@ -1,5 +1,9 @@
 import re, sys, pathlib
 
+# Compiled once at module scope; the substring checks below stay as plain
+# 'in' tests since str.find already beats the regex engine for literals.
+SETUP_RE = re.compile(r"setupCollapsible\(\s*'activeHeader'\s*,\s*'activeList'\s*,\s*false\s*\)")
+
 root = pathlib.Path(__file__).resolve().parent.parent
 index = (root / 'index.html').read_text(encoding='utf-8')
 bootstrap = (root / 'js' / 'bootstrap.js').read_text(encoding='utf-8')
@@ -15,7 +19,7 @@ else:
     ok = False
 
 # 2) bootstrap.js: setupCollapsible for activeHeader should be false (collapsed)
-if re.search(r"setupCollapsible\(\s*'activeHeader'\s*,\s*'activeList'\s*,\s*false\s*\)", bootstrap):
+if SETUP_RE.search(bootstrap):
     pass
 else:
     print("FAIL: setupCollapsible(activeHeader, activeList, false) not found.")
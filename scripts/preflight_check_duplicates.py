@@ -9,40 +9,225 @@ Usage:
 Exits non‑zero if duplicates are found.
 """
 from __future__ import annotations
+import json
+import mmap
+import os
+import subprocess
 import sys
 import re
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-EXPORT_FUNC_RE = re.compile(r"\bexport\s+function\s+([A-Za-z_$][\w$]*)\s*\(")
+# Bytes pattern: the files are scanned as raw bytes so nothing is decoded
+# up front; only the short captured names are decoded, not whole files.
+_EXPORT_FUNC_PATTERN = rb"\bexport\s+function\s+([A-Za-z_$][\w$]*)\s*\("
 
+# RE2 (pip install google-re2) matches with a DFA: no backtracking, a
+# SIMD literal prefilter, and scans that release the GIL. On big trees it
+# beats CPython re by a wide margin; fall back to re when it isn't
+# installed. The API is re-compatible for everything used here.
+try:
+    import re2
+    EXPORT_FUNC_RE = re2.compile(_EXPORT_FUNC_PATTERN)
+except ImportError:
+    EXPORT_FUNC_RE = re.compile(_EXPORT_FUNC_PATTERN)
 
-def scan_dir(root: Path) -> int:
+# Vendored, generated and VCS trees hold no source exports the preflight
+# cares about yet dominate the bytes on a typical Node checkout; prune
+# them during traversal, along with minified bundles.
+DEFAULT_EXCLUDE_DIRS = frozenset(
+    {'node_modules', '.git', 'dist', 'build', 'coverage', '.next'})
+
+# Warm-run memo of per-file scan results; delete the file to invalidate.
+CACHE_FILE = '.preflight_cache.json'
+
+
+def scan_dir(root: Path, fail_fast: bool = False,
+             exclude_dirs: frozenset[str] = DEFAULT_EXCLUDE_DIRS) -> int:
+    # Prefer ripgrep when it is on PATH: one native process walks the tree
+    # and runs the regex over every file far faster than the Python loop.
+    try:
+        return _scan_dir_rg(root, fail_fast, exclude_dirs)
+    except (FileNotFoundError, subprocess.SubprocessError):
+        return _scan_dir_py(root, fail_fast, exclude_dirs)
+
+
+def _scan_dir_rg(root: Path, fail_fast: bool = False,
+                 exclude_dirs: frozenset[str] = DEFAULT_EXCLUDE_DIRS) -> int:
+    cmd = ['rg', '--no-heading', '--with-filename', '-o',
+           '--replace', '$1', '-g', '*.js', '-g', '!*.min.js']
+    for d in sorted(exclude_dirs):
+        cmd += ['-g', f'!{d}/']
+    proc = subprocess.run(
+        cmd + ['-e', _EXPORT_FUNC_PATTERN.decode(), str(root)],
+        capture_output=True, text=True)
+    # rg exits 1 for "no matches", which is a clean result; anything
+    # higher is a real error and we fall back to the Python scan.
+    if proc.returncode > 1:
+        raise subprocess.SubprocessError(proc.stderr.strip())
+    names_by_file: dict[str, Counter] = defaultdict(Counter)
+    for line in proc.stdout.splitlines():
+        # Each line is "<path>:<name>"; the name can't contain a colon,
+        # so rpartition splits correctly even for paths that do.
+        path, sep, name = line.rpartition(':')
+        if sep:
+            names_by_file[path][name] += 1
     dup_count = 0
-    for p in root.rglob('*.js'):
+    for path in sorted(names_by_file):
+        dups = [n for (n, c) in names_by_file[path].items() if c > 1]
+        if dups:
+            dup_count += len(dups)
+            sys.stderr.write(f"Duplicate exports in {path}: {', '.join(dups)}\n")
+            if fail_fast:
+                return dup_count
+    return dup_count
+
+
+def _iter_js(d: str, exclude_dirs: frozenset[str] = DEFAULT_EXCLUDE_DIRS):
+    """Yield paths of .js files under d via a hand-rolled scandir walk.
+
+    scandir reports name and type straight from the directory read, so
+    the walk filters without building a Path or issuing a stat() per
+    entry the way rglob does. Excluded directories are pruned before
+    descent and minified bundles are skipped by name.
+    """
+    with os.scandir(d) as it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False):
+                if e.name not in exclude_dirs:
+                    yield from _iter_js(e.path, exclude_dirs)
+            elif (e.name.endswith('.js') and not e.name.endswith('.min.js')
+                    and e.is_file(follow_symlinks=False)):
+                yield e.path
+
+
+# Above this size a file is scanned through mmap: the regex runs straight
+# off the page cache with no bytes copy, and the pages are shared across
+# the pool workers. Small files aren't worth the extra syscalls.
+_MMAP_THRESHOLD = 256 * 1024
+
+
+def _dups_in(buf) -> list[str]:
+    # Literal prefilter: a plain substring scan is far cheaper than the
+    # regex engine, and most files export nothing. find() rather than
+    # 'in' because mmap has no substring __contains__.
+    if buf.find(b'export function') < 0:
+        return []
+    names = Counter(m.group(1) for m in EXPORT_FUNC_RE.finditer(buf))
+    return [n.decode('utf-8', 'replace') for (n, c) in names.items() if c > 1]
+
+
+def _scan_one(p: str) -> tuple[str, list[str]]:
+    """Pure worker: scan one file and return its duplicate export names.
+
+    No shared state and no output, so it can run in a process pool; the
+    parent aggregates the counts and writes the report.
+    """
+    try:
+        with open(p, 'rb') as fh:
+            if os.fstat(fh.fileno()).st_size > _MMAP_THRESHOLD:
+                with mmap.mmap(fh.fileno(), 0,
+                               access=mmap.ACCESS_READ) as mm:
+                    return p, _dups_in(mm)
+            return p, _dups_in(fh.read())
+    except Exception:
+        return p, []
+
+
+def _load_cache() -> dict:
+    try:
+        with open(CACHE_FILE, encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache: dict) -> None:
+    tmp = CACHE_FILE + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(cache, fh)
+    os.replace(tmp, CACHE_FILE)
+
+
+def _scan_dir_py(root: Path, fail_fast: bool = False,
+                 exclude_dirs: frozenset[str] = DEFAULT_EXCLUDE_DIRS) -> int:
+    # Per-file results are memoized keyed on path+mtime_ns+size: between
+    # commits almost every file is unchanged, so warm runs cost a stat()
+    # per file and only re-read what actually changed. Delete the cache
+    # file to invalidate.
+    cache = _load_cache()
+    fresh: dict[str, list[str]] = {}
+    to_scan: list[tuple[str, str]] = []
+    found: list[tuple[str, list[str]]] = []
+    for p in _iter_js(str(root), exclude_dirs):
         try:
-            text = p.read_text(encoding='utf-8', errors='ignore')
-        except Exception:
+            st = os.stat(p)
+        except OSError:
             continue
-        names = {}
-        for m in EXPORT_FUNC_RE.finditer(text):
-            name = m.group(1)
-            names[name] = names.get(name, 0) + 1
-        dups = [n for (n,c) in names.items() if c > 1]
+        key = f"{p}:{st.st_mtime_ns}:{st.st_size}"
+        if key in cache:
+            fresh[key] = cache[key]
+            found.append((p, cache[key]))
+        else:
+            to_scan.append((p, key))
+
+    dup_count = 0
+
+    def report(p: str, dups: list[str]) -> None:
+        nonlocal dup_count
+        dup_count += len(dups)
+        sys.stderr.write(f"Duplicate exports in {p}: {', '.join(dups)}\n")
+
+    for p, dups in found:
         if dups:
-            dup_count += len(dups)
-            sys.stderr.write(f"Duplicate exports in {p}: {', '.join(dups)}\n")
+            report(p, dups)
+            if fail_fast:
+                _write_cache(fresh)
+                return dup_count
+
+    # Fan the per-file scans out across cores: regex work on one file
+    # overlaps I/O on the next, and chunked submission amortizes the IPC
+    # round-trip over many small files.
+    with ProcessPoolExecutor() as ex:
+        for (p, key), (_, dups) in zip(
+                to_scan, ex.map(_scan_one, (p for p, _ in to_scan),
+                                chunksize=32)):
+            fresh[key] = dups
+            if dups:
+                report(p, dups)
+                if fail_fast:
+                    # One duplicate is enough to fail the preflight.
+                    # map() has already submitted every file, so cancel
+                    # the chunks that haven't started — the with-block's
+                    # own shutdown would wait for all of them.
+                    ex.shutdown(wait=False, cancel_futures=True)
+                    break
+    _write_cache(fresh)
     return dup_count
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/preflight_check_duplicates.py <dir>")
-        sys.exit(2)
-    root = Path(sys.argv[1]).resolve()
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Detect duplicate export function names in JS files")
+    parser.add_argument('dir', help="Directory tree to scan")
+    parser.add_argument('--fail-fast', action='store_true',
+                        help="Stop at the first file with a duplicate "
+                             "(CI feedback without scanning the whole tree)")
+    parser.add_argument('--exclude', action='append', metavar='DIR',
+                        help="Directory name to skip (repeatable); "
+                             f"default: {', '.join(sorted(DEFAULT_EXCLUDE_DIRS))}")
+    args = parser.parse_args()
+    root = Path(args.dir).resolve()
     if not root.exists():
         print(f"Path not found: {root}")
         sys.exit(2)
-    dup_count = scan_dir(root)
+    exclude_dirs = (frozenset(args.exclude) if args.exclude
+                    else DEFAULT_EXCLUDE_DIRS)
+    dup_count = scan_dir(root, fail_fast=args.fail_fast,
+                         exclude_dirs=exclude_dirs)
     if dup_count:
         print(f"Found {dup_count} duplicate export name(s).", file=sys.stderr)
         sys.exit(1)
@@ -5,6 +5,11 @@ ROOT = Path(__file__).resolve().parents[1]
 INDEX = ROOT / 'index.html'
 BOOTSTRAP = ROOT / 'js' / 'bootstrap.js'
 
+# setView([lat,lon], zoom) — applied to a small window after the literal,
+# not the whole of bootstrap.js
+_RE_SETVIEW = re.compile(
+    r"setView\(\s*\[\s*([-0-9\.]+)\s*,\s*([-0-9\.]+)\s*\]\s*,\s*([0-9\.]+)\s*\)")
+
 def read(p: Path) -> str:
     try:
         return p.read_text(encoding='utf-8')
@@ -14,14 +19,20 @@ def read(p: Path) -> str:
 
 def check_recycle_button(html: str) -> list[str]:
     msgs = []
-    if 'id="sidebarBtn1"' not in html:
+    idx = html.find('id="sidebarBtn1"')
+    if idx < 0:
         msgs.append('FAIL: sidebarBtn1 not found in index.html')
-    # Try to verify the recycle emoji is present near the button
-    btn_match = re.search(r'<button[^>]*id="sidebarBtn1"[^>]*>(.*?)</button>', html, re.DOTALL | re.IGNORECASE)
-    if not btn_match:
+        msgs.append('FAIL: Could not locate the sidebarBtn1 button markup')
+        return msgs
+    # Try to verify the recycle emoji is present near the button: the id is
+    # a fixed literal, so locate it with str.find and only inspect the slice
+    # between the enclosing <button ...> and </button> tags.
+    start = html.rfind('<button', 0, idx)
+    end = html.find('</button>', idx)
+    if start < 0 or end < 0:
         msgs.append('FAIL: Could not locate the sidebarBtn1 button markup')
     else:
-        label = btn_match.group(1).strip()
+        label = html[html.find('>', idx) + 1:end].strip()
         if '♻️' not in label:
             msgs.append('WARN: sidebarBtn1 does not contain the ♻️ emoji')
     return msgs
@@ -59,8 +70,17 @@ def check_reset_logic(js: str) -> list[str]:
     return msgs
 
 def extract_default_view(js: str) -> tuple[list[str], list[str]]:
-    # Find setView([lat,lon], zoom)
-    m = re.search(r"setView\(\s*\[\s*([-0-9\.]+)\s*,\s*([-0-9\.]+)\s*\]\s*,\s*([0-9\.]+)\s*\)", js)
+    # Find setView([lat,lon], zoom): hop between literal occurrences with
+    # str.find and run the regex on a short window after each, rather than
+    # over the whole of bootstrap.js. Every occurrence is tried — the first
+    # setView( call isn't necessarily the one with inline coordinates.
+    m = None
+    idx = js.find('setView(')
+    while idx >= 0:
+        m = _RE_SETVIEW.search(js, idx, idx + 256)
+        if m:
+            break
+        idx = js.find('setView(', idx + 1)
     if not m:
         return [], ['WARN: Could not determine default map view (setView)']
     lat, lon, zoom = m.group(1), m.group(2), m.group(3)
@@ -68,14 +88,20 @@ def extract_default_view(js: str) -> tuple[list[str], list[str]]:
 
 def check_show_all_defaults(html: str) -> list[str]:
     msgs = []
-    # Expected defaults: SES/LGAs/CFA checked; Ambulance/Police unchecked
+    # Expected defaults: SES/LGAs/CFA checked; Ambulance/Police unchecked.
+    # The id is a fixed literal, so locate it with str.find and inspect just
+    # the enclosing <input ...> tag instead of compiling a regex per id.
     def has_checked(id_):
-        m = re.search(fr'<input[^>]*id="{id_}"[^>]*>', html)
-        if not m:
+        idx = html.find(f'id="{id_}"')
+        if idx < 0:
+            msgs.append(f'FAIL: {id_} not found')
+            return None
+        start = html.rfind('<input', 0, idx)
+        end = html.find('>', idx)
+        if start < 0 or end < 0:
             msgs.append(f'FAIL: {id_} not found')
             return None
-        tag = m.group(0)
-        return 'checked' in tag
+        return 'checked' in html[start:end]
 
     exp_checked = {
         'toggleAllSES': True,
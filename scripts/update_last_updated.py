@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Write last-updated.txt with the last commit time in friendly AEST form.
+
+Used by the deploy pipeline so the site footer can show when the map
+data was last touched, e.g. "Friday, August 28, 2026 3:07 PM (AEST)".
+
+Usage: python scripts/update_last_updated.py
+"""
+
+import os
+import subprocess
+from datetime import datetime, timedelta, timezone
+
+# A proper tzinfo instead of naive +10h arithmetic: astimezone converts
+# from whatever offset git reports, and the result stays timezone-aware.
+AEST = timezone(timedelta(hours=10))
+
+# Static English tables instead of locale.setlocale + strftime('%A'/'%B'):
+# the output is English regardless of the host locale, and setlocale is a
+# process-global, thread-unsafe libc call this script doesn't need.
+DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+        'Saturday', 'Sunday')
+MONTHS = ('', 'January', 'February', 'March', 'April', 'May', 'June',
+          'July', 'August', 'September', 'October', 'November', 'December')
+
+
+def format_aest(dt):
+    """Render a datetime as the friendly English AEST footer string."""
+    hour12 = ((dt.hour - 1) % 12) + 1
+    ampm = 'AM' if dt.hour < 12 else 'PM'
+    return (f"{DAYS[dt.weekday()]}, {MONTHS[dt.month]} {dt.day}, "
+            f"{dt.year} {hour12}:{dt.minute:02d} {ampm} (AEST)")
+
+
+def main():
+    # text=True decodes in the pipe reader, so no intermediate bytes
+    # object; check=True propagates git failures instead of returning ''.
+    iso_date = subprocess.run(
+        ['git', 'log', '-1', '--format=%cI'],
+        check=True, text=True, capture_output=True).stdout.strip()
+    dt = datetime.fromisoformat(iso_date).astimezone(AEST)
+
+    formatted = format_aest(dt)
+    # Write a sibling and rename so a crash mid-write never leaves the
+    # site footer reading an empty, half-truncated file.
+    tmp = 'last-updated.txt.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(formatted)
+    os.replace(tmp, 'last-updated.txt')
+    print(f"Updated last-updated.txt: {formatted}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,47 +4,157 @@ Cache-busting HTTP server for development
 Adds aggressive cache-busting headers to force browser cache invalidation
 """
 
+import email.utils
+import functools
 import http.server
-import socketserver
+import itertools
 import os
-import mimetypes
+import socket
+import sys
+import time
 from datetime import datetime
 
+# The dev server only ever serves these extensions; a direct dict probe
+# beats mimetypes.guess_type walking its suffix list under a lock.
+_EXT_CT = {
+    '.html': 'text/html; charset=utf-8',
+    '.js': 'application/javascript',
+    '.mjs': 'application/javascript',
+    '.css': 'text/css',
+    '.json': 'application/json',
+    '.geojson': 'application/geo+json',
+    '.map': 'application/json',
+    '.svg': 'image/svg+xml',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.ico': 'image/x-icon',
+    '.webmanifest': 'application/manifest+json',
+    '.woff2': 'font/woff2',
+}
+
+
 class CacheBustingHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # Date formatting is the per-request hot spot: the RFC string only
+    # changes once a second, so cache it on the second boundary instead of
+    # re-running strftime for every header. The ETag just has to be unique
+    # per response, which a plain counter provides without any time call.
+    _last_sec = 0
+    _last_rfc = ''
+    _etag_counter = itertools.count(1)
+
+    # The constant headers never change, so they are encoded once at class
+    # definition and appended to the outgoing buffer as a single blob
+    # instead of six send_header calls (each of which formats and encodes)
+    # per request.
+    _STATIC_HEADERS = (
+        b'Cache-Control: no-cache, no-store, must-revalidate, max-age=0\r\n'
+        b'Pragma: no-cache\r\n'
+        b'Expires: 0\r\n'
+        b'Access-Control-Allow-Origin: *\r\n'
+        b'Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n'
+        b'Access-Control-Allow-Headers: Content-Type\r\n'
+    )
+
+    @classmethod
+    def _http_date(cls):
+        now = int(time.time())
+        if now != cls._last_sec:
+            cls._last_sec = now
+            cls._last_rfc = email.utils.formatdate(now, usegmt=True)
+        return cls._last_rfc
+
     def end_headers(self):
-        # Add aggressive cache-busting headers
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate, max-age=0')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
-        self.send_header('Last-Modified', datetime.now().strftime('%a, %d %b %Y %H:%M:%S GMT'))
-        self.send_header('ETag', f'"{datetime.now().timestamp()}"')
-        
-        # Add CORS headers for development
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        
+        # Only the two dynamic headers go through send_header; the
+        # constant cache-busting and CORS block is appended pre-encoded.
+        self.send_header('Last-Modified', self._http_date())
+        self.send_header('ETag', f'"{next(self._etag_counter)}"')
+        if self.request_version != 'HTTP/0.9':
+            self._headers_buffer.append(self._STATIC_HEADERS)
+
         super().end_headers()
-    
-    def do_GET(self):
-        # Add cache-busting query parameter to all requests
-        if '?' not in self.path:
-            self.path += f'?cb={datetime.now().timestamp()}'
-        elif 'cb=' not in self.path:
-            self.path += f'&cb={datetime.now().timestamp()}'
-        
-        super().do_GET()
-    
+
+    def guess_type(self, path):
+        return _EXT_CT.get(os.path.splitext(path)[1].lower(),
+                           'application/octet-stream')
+
+    def copyfile(self, source, outputfile):
+        # os.sendfile moves the file straight from the page cache to the
+        # socket in the kernel, skipping the userspace read/write copy
+        # loop of the shutil-based default.
+        try:
+            in_fd = source.fileno()
+            out_fd = outputfile.fileno()
+        except (OSError, AttributeError):
+            return super().copyfile(source, outputfile)
+        # Headers are still sitting in the wfile buffer; push them out
+        # before bytes start bypassing it.
+        outputfile.flush()
+        size = os.fstat(in_fd).st_size
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                if not sent:
+                    break
+                offset += sent
+        except OSError:
+            if offset:
+                raise
+            source.seek(0)
+            return super().copyfile(source, outputfile)
+
+    # Request logging; print() would acquire the stdout lock and flush
+    # line-buffered output on every request. Set quiet=True (the -q flag)
+    # to drop logging entirely.
+    quiet = False
+    _log_counter = itertools.count(1)
+
     def log_message(self, format, *args):
-        # Enhanced logging with timestamps
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        print(f"[{timestamp}] {format % args}")
+        if self.quiet:
+            return
+        # time.strftime over an integer localtime skips datetime object
+        # construction; bytes go straight to the stdout buffer and are
+        # flushed every 32nd message instead of per line.
+        sys.stdout.buffer.write(
+            b'[' + time.strftime('%Y-%m-%d %H:%M:%S').encode() + b'] '
+            + (format % args).encode('utf-8', 'replace') + b'\n')
+        if next(self._log_counter) % 32 == 0:
+            sys.stdout.buffer.flush()
+
+class ReusePortHTTPServer(http.server.ThreadingHTTPServer):
+    """ThreadingHTTPServer with SO_REUSEPORT set before bind.
+
+    With SO_REUSEPORT the kernel load-balances accepted connections
+    across every instance bound to the same port, so N copies of this
+    script scale the dev server horizontally — and restarts never hit
+    Address already in use.
+    """
+
+    def server_bind(self):
+        if hasattr(socket, 'SO_REUSEPORT'):
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET,
+                                       socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        super().server_bind()
+
 
 def run_server(port=8000):
     """Start the cache-busting server"""
-    os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    
-    with socketserver.TCPServer(("", port), CacheBustingHTTPRequestHandler) as httpd:
+    # directory= pins the served root per handler instead of os.chdir
+    # mutating process-wide state; translate_path also skips its
+    # per-request os.getcwd() and the server stays safe to embed.
+    root = os.path.dirname(os.path.abspath(__file__))
+    handler = functools.partial(CacheBustingHTTPRequestHandler, directory=root)
+
+    # ThreadingHTTPServer serves each request on its own daemon thread, so
+    # a slow download no longer blocks every other request the way the
+    # single-threaded TCPServer did; allow_reuse_address avoids the
+    # TIME_WAIT "Address already in use" on quick restarts.
+    with ReusePortHTTPServer(("", port), handler) as httpd:
         print(f"🚀 Cache-busting server running on http://localhost:{port}")
         print(f"📅 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("🔄 All requests will include cache-busting headers")
@@ -55,4 +165,16 @@ def run_server(port=8000):
             print("\n🛑 Server stopped")
 
 if __name__ == "__main__":
-    run_server()
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Cache-busting HTTP server for development")
+    parser.add_argument('--port', type=int, default=8000,
+                        help="Port to listen on (default: 8000)")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="Silence per-request logging")
+    args = parser.parse_args()
+
+    if args.quiet:
+        CacheBustingHTTPRequestHandler.quiet = True
+    run_server(args.port)
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Unified single-pass module scanner
+
+The three finder scripts (find-di-migration-issues.py,
+find-baseservice-issues.py, find-singleton-issues.py) used to glob and read
+every file under js/modules separately, so a full preflight read each file
+three times. This module reads each file once and runs all categorized
+checks on the same buffer; the finder scripts are thin entry points that
+select their category from the combined result.
+
+Usage: python unified_scan.py [di|baseservice|singleton]
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_right
+import multiprocessing
+from collections import namedtuple
+from pathlib import Path
+
+# Precompiled module-level patterns: the same handful of regexes run over
+# every file, so avoid the per-call cache lookup inside the scan loop.
+# Bytes patterns run directly on the mmap without decoding.
+_RE_CONSTRUCTOR = re.compile(rb'constructor\s*\([^)]*\)\s*{', re.DOTALL)
+_RE_CONSTRUCTOR_PARAMS = re.compile(rb'constructor\s*\(([^)]*)\)', re.DOTALL)
+_RE_SUPER = re.compile(rb'super\s*\([^)]*\)')
+_RE_LEGACY_IMPORTS = [re.compile(p) for p in [
+    rb'import\s*{\s*stateManager\s*}\s*from\s*[\'"]\./StateManager\.js[\'"]',
+    rb'import\s*{\s*globalEventBus\s*}\s*from\s*[\'"]\./EventBus\.js[\'"]',
+    rb'import\s*{\s*configurationManager\s*}\s*from\s*[\'"]\./ConfigurationManager\.js[\'"]',
+    rb'import\s*{\s*searchManager\s*}\s*from\s*[\'"]\./SearchManager\.js[\'"]',
+    rb'import\s*{\s*collapsibleManager\s*}\s*from\s*[\'"]\./CollapsibleManager\.js[\'"]'
+]]
+_RE_MOCK_LOGGER = [re.compile(p) for p in [
+    rb'const\s+logger\s*=\s*{',
+    rb'// Temporarily use a mock logger',
+    rb'this\.logger\s*=\s*logger\.createChild',
+    rb'logger\.createChild\s*\(\s*{\s*module:'
+]]
+_RE_SINGLETON_EXPORTS = [re.compile(p) for p in [
+    rb'export\s+const\s+\w+\s*=\s*new\s+\w+\(\)',
+    rb'export\s+const\s+\w+\s*=\s*new\s+\w+\([^)]*\)'
+]]
+_SINGLETON_PATTERNS = [re.compile(p) for p in [
+    rb'export\s+const\s+\w+\s*=\s*new\s+\w+\([^)]*\)',
+    rb'const\s+\w+\s*=\s*new\s+\w+\([^)]*\)',
+    rb'export\s*{\s*\w+\s*}\s*;'
+]]
+
+DI_CATEGORIES = (
+    'incomplete_di_constructors',
+    'legacy_function_imports',
+    'mock_logger_usage',
+    'missing_inject_decorators',
+    'incorrect_super_calls',
+    'legacy_singleton_exports'
+)
+
+CATEGORIES = ('di', 'baseservice', 'singleton')
+
+# Lightweight per-issue record: a plain tuple body is a fraction of the
+# size of the dict it replaces and cheaper to append; it round-trips
+# through the JSON cache as an array and is rehydrated on load. Reports
+# call _asdict() only at serialization time.
+Issue = namedtuple('Issue', ('file', 'issue', 'line', 'severity'))
+
+# Sidecar cache so repeated runs only rescan files that changed
+CACHE_FILE = '.unified-scan-cache.json'
+
+# Single-pass multi-pattern scan: every import/mock-logger/singleton pattern
+# is anchored by a short literal, so one fused pass over the content finds
+# all trigger positions and the full regex for a category then runs only on
+# a small window around each hit instead of traversing the whole file per
+# pattern. Entries are (pattern, category, message prefix, severity).
+_TRIGGER_WINDOW = 200
+_TRIGGERS = {
+    b'stateManager': [(_RE_LEGACY_IMPORTS[0], 'legacy_function_imports', 'Legacy function import', 'high')],
+    b'globalEventBus': [(_RE_LEGACY_IMPORTS[1], 'legacy_function_imports', 'Legacy function import', 'high')],
+    b'configurationManager': [(_RE_LEGACY_IMPORTS[2], 'legacy_function_imports', 'Legacy function import', 'high')],
+    b'searchManager': [(_RE_LEGACY_IMPORTS[3], 'legacy_function_imports', 'Legacy function import', 'high')],
+    b'collapsibleManager': [(_RE_LEGACY_IMPORTS[4], 'legacy_function_imports', 'Legacy function import', 'high')],
+    b'logger': [(_RE_MOCK_LOGGER[0], 'mock_logger_usage', 'Mock logger usage', 'medium'),
+                (_RE_MOCK_LOGGER[1], 'mock_logger_usage', 'Mock logger usage', 'medium')],
+    b'createChild': [(_RE_MOCK_LOGGER[2], 'mock_logger_usage', 'Mock logger usage', 'medium'),
+                     (_RE_MOCK_LOGGER[3], 'mock_logger_usage', 'Mock logger usage', 'medium')],
+    b'export': [(_RE_SINGLETON_EXPORTS[0], 'legacy_singleton_exports', 'Legacy singleton export', 'medium'),
+                (_RE_SINGLETON_EXPORTS[1], 'legacy_singleton_exports', 'Legacy singleton export', 'medium')],
+}
+_RE_TRIGGERS = re.compile(b'|'.join(re.escape(t) for t in _TRIGGERS))
+
+
+def _content_hash(data):
+    """Fingerprint file bytes (keyed blake2b is the stdlib fast hash)."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _scanner_version():
+    """Hash of this module's own source; changing the checks invalidates the cache."""
+    with open(__file__, 'rb') as f:
+        return _content_hash(f.read())
+
+
+def _empty_issues():
+    return {
+        'di': {category: [] for category in DI_CATEGORIES},
+        'baseservice': None,
+        'singleton': None
+    }
+
+
+def scan_file(file_path, base_path, cached=None):
+    """Scan a single file for every category and return ``(path, cache_entry)``.
+
+    Pure function (no shared state) so it can run in a worker process;
+    scanning is CPU-bound regex work and each file is independent. The
+    stat is taken through the already-open fd so the recorded metadata
+    describes exactly the bytes that were read. When the content hash
+    still matches the cached entry (e.g. a touch without an edit), the
+    cached issues are reused and only the stat fields are refreshed.
+    """
+    file_path = str(file_path)
+    relative_path = Path(file_path).relative_to(base_path)
+    issues = _empty_issues()
+    try:
+        # mmap the file instead of read(): JS source is ASCII-dominant, so
+        # the bytes patterns run directly on the mapping with no full-file
+        # copy and no UTF-8 decode.
+        with open(file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size == 0:
+                return file_path, {
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': 0,
+                    'hash': _content_hash(b''),
+                    'issues': issues
+                }
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest = _content_hash(mm)
+                if cached is not None and cached.get('hash') == digest:
+                    return file_path, {
+                        'mtime_ns': stat.st_mtime_ns,
+                        'size': stat.st_size,
+                        'hash': digest,
+                        'issues': cached['issues']
+                    }
+
+                # Decide once which categories can apply to this file; a
+                # couple of substring probes replace re-running the same
+                # 'extends BaseService' search inside every check and let
+                # most files skip the constructor/super/inject passes.
+                has_base = mm.find(b'extends BaseService') >= 0
+                has_injectable = mm.find(b'@injectable()') >= 0
+
+                # One newline index shared by every check in this file, so
+                # line lookups are a bisect instead of counting a prefix
+                # slice; the trigger pass builds it lazily when no other
+                # check needed it.
+                nl_offsets = None
+                if has_base or has_injectable:
+                    nl_offsets = _newline_index(mm)
+
+                di = issues['di']
+                if has_base:
+                    _check_incomplete_di_constructor(mm, relative_path, di, nl_offsets)
+                    _check_incorrect_super_calls(mm, relative_path, di, nl_offsets)
+                if has_injectable:
+                    _check_missing_inject_decorators(mm, relative_path, di, nl_offsets)
+                _check_literal_triggers(mm, relative_path, di, nl_offsets)
+                if has_base:
+                    issues['baseservice'] = _check_baseservice(mm, file_path)
+                    issues['singleton'] = _check_singleton(mm, file_path)
+
+        return file_path, {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': digest,
+            'issues': issues
+        }
+
+    except Exception as e:
+        print(f"Error scanning {file_path}: {e}")
+        return file_path, None
+
+
+def _scan_job(args):
+    """Unpack one (file_path, base_path, cached) work item for the pool."""
+    return scan_file(*args)
+
+
+def _check_incomplete_di_constructor(content, relative_path, issues, nl_offsets):
+    """Check for modules extending BaseService but not properly injecting StructuredLogger.
+
+    Only called for files that contain 'extends BaseService'.
+    """
+    # Check if constructor has proper DI injection
+    constructor_match = _RE_CONSTRUCTOR.search(content)
+    if constructor_match:
+        constructor_content = constructor_match.group(0)
+
+        # Check for missing @inject decorators
+        if b'@inject(TYPES.StructuredLogger)' not in constructor_content:
+            issues['incomplete_di_constructors'].append(Issue(
+                str(relative_path),
+                'Missing StructuredLogger injection',
+                _get_line_number(nl_offsets, constructor_match.start()),
+                'high'))
+
+        # Check for missing super() call
+        if b'super(' not in constructor_content:
+            issues['incomplete_di_constructors'].append(Issue(
+                str(relative_path),
+                'Missing super() call',
+                _get_line_number(nl_offsets, constructor_match.start()),
+                'high'))
+
+
+def _check_literal_triggers(content, relative_path, issues, nl_offsets):
+    """Single pass over the content for all literal-anchored categories.
+
+    Covers legacy function imports, mock logger usage and legacy singleton
+    exports. The fused trigger regex visits every byte once; each hit runs
+    only the patterns keyed by that literal on a bounded window around it.
+    Matches are deduplicated by absolute position since nearby trigger hits
+    can share a window.
+    """
+    seen = set()
+    for hit in _RE_TRIGGERS.finditer(content):
+        if nl_offsets is None:
+            nl_offsets = _newline_index(content)
+        start = max(0, hit.start() - _TRIGGER_WINDOW)
+        end = hit.start() + _TRIGGER_WINDOW
+        window = content[start:end]
+        for pattern, category, prefix, severity in _TRIGGERS[hit.group(0)]:
+            for match in pattern.finditer(window):
+                position = start + match.start()
+                key = (id(pattern), position)
+                if key in seen:
+                    continue
+                seen.add(key)
+                issues[category].append(Issue(
+                    str(relative_path),
+                    f"{prefix}: {match.group(0).strip().decode('utf-8', 'replace')}",
+                    _get_line_number(nl_offsets, position),
+                    severity))
+
+
+def _check_missing_inject_decorators(content, relative_path, issues, nl_offsets):
+    """Check for missing @inject decorators in constructors.
+
+    Only called for files that contain '@injectable()'.
+    """
+    if content.find(b'constructor(') >= 0:
+        # Find constructor parameters
+        constructor_match = _RE_CONSTRUCTOR_PARAMS.search(content)
+        if constructor_match:
+            params = constructor_match.group(1).strip()
+            if params and b'@inject(' not in params:
+                issues['missing_inject_decorators'].append(Issue(
+                    str(relative_path),
+                    'Constructor parameters missing @inject decorators',
+                    _get_line_number(nl_offsets, constructor_match.start()),
+                    'high'))
+
+
+def _check_incorrect_super_calls(content, relative_path, issues, nl_offsets):
+    """Check for incorrect super() calls.
+
+    Only called for files that contain 'extends BaseService'.
+    """
+    super_calls = _RE_SUPER.finditer(content)
+    for match in super_calls:
+        super_content = match.group(0)
+        if b'structuredLogger' not in super_content and b'logger' not in super_content:
+            issues['incorrect_super_calls'].append(Issue(
+                str(relative_path),
+                f"Incorrect super() call: {super_content.decode('utf-8', 'replace')}",
+                _get_line_number(nl_offsets, match.start()),
+                'high'))
+
+
+def _check_baseservice(content, file_path):
+    """BaseService inheritance without StructuredLogger injection.
+
+    Only called for files that contain 'extends BaseService'.
+    """
+    if content.find(b'@inject(TYPES.StructuredLogger)') >= 0:
+        return None
+    constructor_match = _RE_CONSTRUCTOR.search(content)
+    if not constructor_match:
+        return None
+    return {
+        'file': file_path,
+        'line': content[:constructor_match.start()].count(b'\n') + 1,
+        'constructor': constructor_match.group(0).strip().decode('utf-8', 'replace')
+    }
+
+
+def _check_singleton(content, file_path):
+    """Singleton creation in modules that extend BaseService.
+
+    Only called for files that contain 'extends BaseService'.
+    """
+    for pattern in _SINGLETON_PATTERNS:
+        matches = pattern.findall(content)
+        if matches:
+            # Check if it's not already a legacy function
+            if content.find(b'Legacy function called') < 0:
+                return {
+                    'file': file_path,
+                    'pattern': pattern.pattern.decode('utf-8'),
+                    'matches': [m.decode('utf-8', 'replace') for m in matches]
+                }
+            break
+    return None
+
+
+def _newline_index(content):
+    """Offsets of every newline in the content, built in one pass per file."""
+    offsets = array('q')
+    start = 0
+    while True:
+        i = content.find(b'\n', start)
+        if i < 0:
+            return offsets
+        offsets.append(i)
+        start = i + 1
+
+
+def _get_line_number(nl_offsets, position):
+    """Get line number for a position via bisect over the newline index"""
+    return bisect_right(nl_offsets, position) + 1
+
+
+def _iter_js(base):
+    """Yield ``(path, stat)`` for regular .js files in ``base``.
+
+    os.scandir fills name, type and stat from a single directory read, so
+    no per-file stat syscall or Path object is needed; the returned stat
+    feeds the cache check directly.
+    """
+    with os.scandir(base) as entries:
+        for entry in entries:
+            if entry.name.endswith('.js') and entry.is_file(follow_symlinks=False):
+                yield entry.path, entry.stat()
+
+
+def _load_cache():
+    """Load the scan cache, discarding it when the scanner itself changed."""
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('scanner_version') != _scanner_version():
+        return {}
+    return cache.get('files', {})
+
+
+def _save_cache(entries):
+    """Persist scan results keyed by path, stat and content hash.
+
+    Serialized in one dumps call and swapped in with os.replace so an
+    interrupted run never leaves a truncated cache behind.
+    """
+    buf = json.dumps({'scanner_version': _scanner_version(),
+                      'files': entries}).encode('utf-8')
+    try:
+        with open(CACHE_FILE + '.tmp', 'wb') as f:
+            f.write(buf)
+        os.replace(CACHE_FILE + '.tmp', CACHE_FILE)
+    except OSError as e:
+        print(f"Warning: could not write {CACHE_FILE}: {e}")
+
+
+def scan_all(base_path='js/modules', categories=CATEGORIES):
+    """Scan every module file once and return results per category.
+
+    Returns a dict with (depending on ``categories``):
+      'di'          -> dict of DI issue lists keyed by DI_CATEGORIES
+      'baseservice' -> list of BaseService inheritance issues
+      'singleton'   -> list of singleton creation issues
+    """
+    base = Path(base_path)
+    if not base.exists():
+        print(f"Directory {base} does not exist")
+        return {category: ({} if category == 'di' else []) for category in categories}
+
+    js_files = sorted(_iter_js(base))
+    cached_entries = _load_cache()
+
+    # Cheap stat check first: files whose (mtime_ns, size) are unchanged
+    # reuse their cached issues without being read at all. The stat comes
+    # straight from the scandir entry.
+    fresh_entries = {}
+    to_scan = []
+    for file_path, stat in js_files:
+        cached = cached_entries.get(file_path)
+        if (cached is not None
+                and cached['mtime_ns'] == stat.st_mtime_ns
+                and cached['size'] == stat.st_size):
+            fresh_entries[file_path] = cached
+            continue
+        to_scan.append((file_path, cached))
+
+    print(f"Scanning {len(js_files)} JavaScript files "
+          f"({len(fresh_entries)} unchanged, from cache)...")
+
+    # Each file scans independently, so fan out across cores; chunksize
+    # batches files per IPC round-trip to amortize pickling overhead.
+    # imap_unordered streams results back as workers finish instead of
+    # waiting for the whole batch, so slow files don't hold up the merge
+    # and entries accumulate incrementally rather than in one final reduce.
+    if to_scan:
+        with multiprocessing.Pool() as pool:
+            results = pool.imap_unordered(
+                _scan_job,
+                ((fp, base, cached) for fp, cached in to_scan),
+                chunksize=16)
+            for file_path, entry in results:
+                if entry is not None:
+                    fresh_entries[file_path] = entry
+
+    _save_cache(fresh_entries)
+
+    merged = {}
+    if 'di' in categories:
+        di = {category: [] for category in DI_CATEGORIES}
+        for file_path in sorted(fresh_entries):
+            for category, found in fresh_entries[file_path]['issues']['di'].items():
+                # Cached entries come back as plain JSON arrays; fresh ones
+                # are already Issue tuples. Both unpack the same way, and
+                # interning the repeated severity strings keeps one copy.
+                di[category].extend(
+                    Issue(f, i, line, sys.intern(severity))
+                    for f, i, line, severity in found)
+        merged['di'] = di
+    if 'baseservice' in categories:
+        merged['baseservice'] = [
+            fresh_entries[fp]['issues']['baseservice']
+            for fp in sorted(fresh_entries)
+            if fresh_entries[fp]['issues']['baseservice'] is not None]
+    if 'singleton' in categories:
+        merged['singleton'] = [
+            fresh_entries[fp]['issues']['singleton']
+            for fp in sorted(fresh_entries)
+            if fresh_entries[fp]['issues']['singleton'] is not None]
+    return merged
+
+
+def _issues_as_dicts(results):
+    """Convert Issue tuples to dicts for JSON output."""
+    out = {}
+    for category, value in results.items():
+        if category == 'di':
+            out['di'] = {c: [i._asdict() for i in iss] for c, iss in value.items()}
+        else:
+            out[category] = value
+    return out
+
+
+def main():
+    categories = tuple(sys.argv[1:]) or CATEGORIES
+    unknown = [c for c in categories if c not in CATEGORIES]
+    if unknown:
+        print(f"Unknown categories: {', '.join(unknown)} (expected: {', '.join(CATEGORIES)})")
+        sys.exit(1)
+    results = scan_all(categories=categories)
+    print(json.dumps(_issues_as_dicts(results), indent=2))
+
+
+if __name__ == '__main__':
+    main()